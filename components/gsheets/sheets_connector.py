@@ -7,6 +7,22 @@ from typing import Optional, Union, Iterable
 from datetime import timezone, timedelta
 
 
+QUERY_TTL = 600
+
+def downcast_floats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast float64 columns of a Pandas DataFrame to float32.
+
+    Parameters:
+    - df (pd.DataFrame): Input DataFrame.
+
+    Returns:
+    pd.DataFrame: Copy of the DataFrame with float32 instead of float64 columns.
+    """
+    float_columns = df.select_dtypes(include=['float64']).columns
+    return df.astype({col: 'float32' for col in float_columns})
+
+
 class DatabaseConnector(ABC):
     """
     Abstract class for connecting to and querying a Google Sheets database.
@@ -24,6 +40,21 @@ class DatabaseConnector(ABC):
         self.table_name = table_name
         self.conn = self._create_connection()
 
+    def download_sheet(self, sheet_name: str) -> pd.DataFrame:
+        """
+        Download a sheet without processing it or rendering any elements.
+
+        The result lands in the connection's query cache, so a following get_data_from_sheet
+        call for the same sheet only processes the data.
+
+        Parameters:
+        - sheet_name (str): Name of the sheet.
+
+        Returns:
+        pd.DataFrame: Raw sheet data in the pandas dataframe.
+        """
+        return self.conn.query(sql=f"SELECT * FROM {sheet_name}", ttl=QUERY_TTL)
+
     @abstractmethod
     def _create_connection(self) -> st.connection:
         """
@@ -130,7 +161,7 @@ class MomentumSheetsConnector(DatabaseConnector):
         pd.DataFrame: Result of the query in the pandas dataframe.
         """
         try:
-            df = self.conn.query(sql=sql)
+            df = self.conn.query(sql=sql, ttl=QUERY_TTL)
             return (
                 df
                 .pipe(self.convert_timezone, ['Purchase date', 'Sale date'], 0, '%d.%m.%Y')
@@ -184,18 +215,17 @@ class MomentumSheetsConnector(DatabaseConnector):
         Returns:
         pd.DataFrame: DataFrame with converted timezone.
         """
-        df = df.copy()
-
         if isinstance(timestamp_col, str):
             # If timestamp_col is a single string, convert it to a list for consistency
             timestamp_col = [timestamp_col]
 
-        for col in timestamp_col:
-            df[col] = pd.to_datetime(df[col], format=time_format)
-            df[col] = df[col].dt.tz_localize(timezone.utc)
-            df[col] = df[col].dt.tz_convert(timezone(timedelta(hours=tz_offset)))
+        tz = timezone(timedelta(hours=tz_offset))
+        converted_cols = {
+            col: pd.to_datetime(df[col], format=time_format, utc=True).dt.tz_convert(tz)
+            for col in timestamp_col
+        }
 
-        return df
+        return df.assign(**converted_cols)
 
     def remove_na(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -208,7 +238,7 @@ class MomentumSheetsConnector(DatabaseConnector):
         pd.DataFrame: DataFrame with NaN values removed.
         """
         return df.dropna()
-    
+
 
 class CoinApiSheetsConnector(DatabaseConnector):
     def __init__(self, table_name: Optional[str] = None):
@@ -234,11 +264,13 @@ class CoinApiSheetsConnector(DatabaseConnector):
         pd.DataFrame: Result of the query in the pandas dataframe.
         """
         try:
-            df = self.conn.query(sql=sql)
+            df = self.conn.query(sql=sql, ttl=QUERY_TTL)
             return (
                 df
                 .pipe(self.convert_timezone, 'Date in GMT / Coin Ticker', 0)
                 .pipe(self.rename_columns, 'Date in GMT / Coin Ticker', 'datetime')
+                .pipe(self.remove_na)
+                .pipe(downcast_floats)
             )
         except Exception as e:
             st.error(f"Error executing query: {e}")
@@ -288,18 +320,17 @@ class CoinApiSheetsConnector(DatabaseConnector):
         Returns:
         pd.DataFrame: DataFrame with converted timezone.
         """
-        df = df.copy()
-
         if isinstance(timestamp_col, str):
             # If timestamp_col is a single string, convert it to a list for consistency
             timestamp_col = [timestamp_col]
 
-        for col in timestamp_col:
-            df[col] = pd.to_datetime(df[col], format=time_format)
-            df[col] = df[col].dt.tz_localize(timezone.utc)
-            df[col] = df[col].dt.tz_convert(timezone(timedelta(hours=tz_offset)))
+        tz = timezone(timedelta(hours=tz_offset))
+        converted_cols = {
+            col: pd.to_datetime(df[col], format=time_format, utc=True).dt.tz_convert(tz)
+            for col in timestamp_col
+        }
 
-        return df
+        return df.assign(**converted_cols)
 
     def remove_na(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -311,5 +342,5 @@ class CoinApiSheetsConnector(DatabaseConnector):
         Returns:
         pd.DataFrame: DataFrame with NaN values removed.
         """
-        return df.dropna(axis=1, inplace=True)
+        return df.dropna(axis=1)
     
\ No newline at end of file
@@ -1,12 +1,16 @@
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
+from numba import njit
 from .gsheets.sheets_connector import CoinApiSheetsConnector
 
 
-st.cache_data(ttl=600)
+CORR_TAB_WIDGET_KEYS = ('correlation_threshold', 'selected_base_coins', 'hide_corr_graph', 'use_log_scale')
+
+
+@st.cache_data(ttl=600)
 def retrieve_coin_api_data(gsheet_connection: str, sheet: str) -> pd.DataFrame:
     """
     Retrieves coin API data from a Google Sheet.
@@ -29,7 +33,37 @@ def retrieve_coin_api_data(gsheet_connection: str, sheet: str) -> pd.DataFrame:
     df = spreadsheet.get_data_from_sheet(sheet)
     return df
 
-st.cache_data(ttl=600)
+@njit(cache=True)
+def _negative_correlation_edges(values: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scans a square correlation matrix for off-diagonal values below the threshold.
+
+    Parameters:
+    - values (np.ndarray): Square correlation matrix.
+    - threshold (float): Upper bound (exclusive) for the correlation value.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray]: Row and column indices of the matching cells.
+    """
+    n = values.shape[0]
+    count = 0
+    for i in range(n):
+        for j in range(n):
+            if i != j and values[i, j] < threshold:
+                count += 1
+
+    rows = np.empty(count, dtype=np.int64)
+    cols = np.empty(count, dtype=np.int64)
+    k = 0
+    for i in range(n):
+        for j in range(n):
+            if i != j and values[i, j] < threshold:
+                rows[k] = i
+                cols[k] = j
+                k += 1
+
+    return rows, cols
+
 def find_negative_correlation_coins(correlation_matrix: pd.DataFrame) -> Dict[str, Dict[str, float]]:
     """
     Finds coins with negative correlation.
@@ -40,22 +74,22 @@ def find_negative_correlation_coins(correlation_matrix: pd.DataFrame) -> Dict[st
     Returns:
     Dict[str, Dict[str, float]]: Dictionary of coins with negative correlation.
     """
-    coins_with_negative_corr = {}
+    base_coins = correlation_matrix.index.to_numpy()
+    coins = correlation_matrix.columns.to_numpy()
+    values = correlation_matrix.to_numpy(dtype=np.float64)
 
-    for base_coin in correlation_matrix.index:
-        negative_corr_coins = {}
+    rows, cols = _negative_correlation_edges(values, 0.0)
 
-        for coin in correlation_matrix.columns:
-            if base_coin != coin and correlation_matrix.loc[base_coin, coin] < 0:
-                correlation_value = correlation_matrix.loc[base_coin, coin]
-                negative_corr_coins[coin] = correlation_value
-
-        coins_with_negative_corr[base_coin] = negative_corr_coins
+    coins_with_negative_corr = {base_coin: {} for base_coin in base_coins}
+    for row, col in zip(rows, cols):
+        coins_with_negative_corr[base_coins[row]][coins[col]] = values[row, col]
 
     return coins_with_negative_corr
 
-st.cache_data(ttl=600)
-def visualize_negative_correlations(coins_with_negative_corr: Dict[str, Dict[str, float]]):
+@st.cache_data(ttl=600)
+def visualize_negative_correlations(coins_with_negative_corr: Dict[str, Dict[str, float]],
+                                    correlation_threshold: float,
+                                    selected_base_coins: Optional[List[str]]):
     """
     Visualizes coins with negative correlation.
 
@@ -66,14 +100,14 @@ def visualize_negative_correlations(coins_with_negative_corr: Dict[str, Dict[str
     """
     fig = go.Figure()
 
-    selected_base_coins = st.session_state.selected_base_coins
+    traces = []
     for base_coin, negative_corr_coins in coins_with_negative_corr.items():
         if selected_base_coins and base_coin not in selected_base_coins:
             continue
 
         for coin, correlation_value in negative_corr_coins.items():
-            if correlation_value < st.session_state.correlation_threshold:
-                fig.add_trace(go.Scatter(
+            if correlation_value < correlation_threshold:
+                traces.append(go.Scatter(
                     x=[base_coin, coin],
                     y=[0, correlation_value],
                     mode='lines+markers',
@@ -81,6 +115,9 @@ def visualize_negative_correlations(coins_with_negative_corr: Dict[str, Dict[str
                     text=f'Correlation: {correlation_value:.2f}'
                 ))
 
+    # add all traces at once instead of rebuilding the figure's trace tuple per edge
+    fig.add_traces(traces)
+
     fig.update_layout(
         title = f'Negative Correlations (Base Coins: {", ".join(selected_base_coins) if selected_base_coins else "All"})',
         xaxis_title='Coins',
@@ -91,20 +128,43 @@ def visualize_negative_correlations(coins_with_negative_corr: Dict[str, Dict[str
 
     st.plotly_chart(fig, use_container_width=True)
 
-st.cache_data(ttl=600)
-def visualize_line_chart(coins_with_negative_corr, coin_api_data):
+@st.cache_data(ttl=600)
+def visualize_line_chart(coins_with_negative_corr: Dict[str, Dict[str, float]],
+                         coin_api_data: pd.DataFrame,
+                         correlation_threshold: float,
+                         selected_base_coins: List[str],
+                         use_log_scale: bool):
+    """
+    Visualizes price percentage change of the selected base coins and their negatively correlated coins.
+
+    Parameters:
+    - coins_with_negative_corr (Dict[str, Dict[str, float]]): Dictionary of coins with negative correlation.
+    - coin_api_data (pd.DataFrame): Price percentage change data with a 'datetime' column.
+    - correlation_threshold (float): Correlation threshold.
+    - selected_base_coins (List[str]): List of selected base coins.
+    - use_log_scale (bool): Whether to use a logarithmic y-axis.
+    """
     fig = go.Figure()
     
-    selected_base_coins = st.session_state.selected_base_coins
     y = []
     for base_coin in selected_base_coins:
         if base_coin not in y:
             y.append(base_coin)
         for corr_coin, corr_value in coins_with_negative_corr[base_coin].items():
-            if corr_coin not in y and corr_value < st.session_state.correlation_threshold:
+            if corr_coin not in y and corr_value < correlation_threshold:
                 y.append(corr_coin)
     
-    fig = px.line(coin_api_data, x="datetime", y=y)
+    # WebGL traces keep long price histories interactive
+    fig.add_traces([
+        go.Scattergl(
+            x=coin_api_data['datetime'],
+            y=coin_api_data[col],
+            name=col,
+            mode='lines',
+            visible=True if col in selected_base_coins else 'legendonly'
+        )
+        for col in y
+    ])
 
     fig.update_layout(
         title="Price Percentage Change Over Time",
@@ -115,18 +175,56 @@ def visualize_line_chart(coins_with_negative_corr, coin_api_data):
     )
 
     fig.update_layout({"uirevision": "foo"}, overwrite=True)
-    fig.for_each_trace(lambda trace: trace.update(visible="legendonly") 
-                   if trace.name not in selected_base_coins else ())
     
-    if st.session_state.use_log_scale:
+    if use_log_scale:
         fig.update_layout(yaxis_type="log")
     
     st.plotly_chart(fig, use_container_width=True)
 
-st.cache_data(ttl=600)
+@st.cache_data(ttl=600)
 def drop_duplicates(data: pd.DataFrame, condition_column: str) -> pd.DataFrame:
-    duplicate_indexes = data[data.duplicated(condition_column)].index
-    return data.drop(duplicate_indexes)
+    return data.drop_duplicates(subset=[condition_column])
+
+def calculate_correlation_and_pct_change(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calculates the correlation matrix and the percentage change of the numeric columns from a single float32 buffer.
+
+    Parameters:
+    - data (pd.DataFrame): Coin API data with numeric price columns.
+
+    Returns:
+    Tuple[pd.DataFrame, pd.DataFrame]: Correlation matrix and price percentage change data.
+    """
+    # np.corrcoef has no pairwise NaN handling like DataFrame.corr, this relies on
+    # CoinApiSheetsConnector.remove_na dropping every column that contains NaN
+    numeric_data = data.select_dtypes(include=['number'])
+    columns = numeric_data.columns
+    values = numeric_data.to_numpy(dtype=np.float32)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlation = np.corrcoef(values, rowvar=False)
+        pct_change = np.vstack([np.full((1, values.shape[1]), np.nan, dtype=np.float32), values[1:] / values[:-1] - 1])
+
+    correlation_matrix = pd.DataFrame(np.atleast_2d(correlation), index=columns, columns=columns)
+    coin_pct_change = pd.DataFrame(pct_change, index=numeric_data.index, columns=columns)
+    return correlation_matrix, coin_pct_change
+
+@st.cache_data(ttl=600)
+def compute_correlation_artifacts(data: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Dict[str, float]]]:
+    """
+    Computes everything in the correlation tab that does not depend on widget state.
+
+    Parameters:
+    - data (pd.DataFrame): Deduplicated coin API data with a 'datetime' column.
+
+    Returns:
+    Tuple[pd.DataFrame, pd.DataFrame, Dict[str, Dict[str, float]]]: Correlation matrix, price percentage
+    change data with a 'datetime' column, and the dictionary of coins with negative correlation.
+    """
+    correlation_matrix, coin_pct_change = calculate_correlation_and_pct_change(data)
+    coin_pct_change['datetime'] = data['datetime']
+    correlation_structure = find_negative_correlation_coins(correlation_matrix)
+    return correlation_matrix, coin_pct_change, correlation_structure
 
 def show_params_container(base_coins_list) -> None:
     params_container = st.container()
@@ -139,36 +237,32 @@ def show_params_container(base_coins_list) -> None:
             st.multiselect("Select Base Coins:", base_coins_list, key="selected_base_coins")
             st.toggle("use log scale", value=False, key="use_log_scale")
 
-st.cache_data(ttl=600)
 def show_charts_container(correlation_structure: Dict[str, Dict[str, float]], coin_pct_change: pd.DataFrame) -> None:
     charts_container = st.container()
     selected_base_coins = st.session_state.selected_base_coins
+    correlation_threshold = st.session_state.correlation_threshold
+    use_log_scale = st.session_state.use_log_scale
 
     if st.session_state.hide_corr_graph:
         with charts_container:
             if selected_base_coins:
-                visualize_line_chart(correlation_structure, coin_pct_change)
+                visualize_line_chart(correlation_structure, coin_pct_change, correlation_threshold, selected_base_coins, use_log_scale)
     else:
         with charts_container:
             corr_chart_col, line_chart_col = st.columns(2)
             with corr_chart_col:
-                visualize_negative_correlations(correlation_structure)
+                visualize_negative_correlations(correlation_structure, correlation_threshold, selected_base_coins)
             with line_chart_col:
                 if selected_base_coins:
-                    visualize_line_chart(correlation_structure, coin_pct_change)
+                    visualize_line_chart(correlation_structure, coin_pct_change, correlation_threshold, selected_base_coins, use_log_scale)
 
-st.cache_data(ttl=600)
 def show_corr_data():
     coin_api_data = retrieve_coin_api_data('coinapigsheets', 'raw_data')
     coin_api_data_cleaned = drop_duplicates(coin_api_data, 'datetime')
 
-    coin_pct_change = coin_api_data_cleaned.select_dtypes(include=['number']).pct_change()
-    coin_pct_change['datetime'] = coin_api_data_cleaned['datetime']
-
-    correlation_matrix = coin_api_data_cleaned.corr(numeric_only=True)
+    correlation_matrix, coin_pct_change, correlation_structure = compute_correlation_artifacts(coin_api_data_cleaned)
 
     st.subheader('*Correlation Visualization*')
-    correlation_structure = find_negative_correlation_coins(correlation_matrix)
     show_params_container(list(correlation_structure.keys()))
     show_charts_container(correlation_structure, coin_pct_change)
 
@@ -1,54 +1,287 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import itertools
 
-from .gsheets.sheets_connector import MomentumSheetsConnector
-from typing import Union, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from numba import njit
+from .gsheets.sheets_connector import MomentumSheetsConnector, downcast_floats
+from typing import Dict, Union, Tuple
 from requests import Session
-from requests.exceptions import ConnectionError, Timeout, TooManyRedirects
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, HTTPError, Timeout, TooManyRedirects, RetryError
+from urllib3.util.retry import Retry
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 
+RAW_DATA_PAGE_SIZE = 500
+CHART_MAX_POINTS = 2000
+
+PROFIT_LOSS_STATS = ('Total', 'Mean', 'Count', 'Standard Deviation', 'Minimum', 'Maximum', 'Median')
+
+MAIN_TAB_WIDGET_KEYS = ('date_range_slider', 'exclude_outliers', 'raw_data_page')
+
+
+@st.cache_resource
+def get_coinmarketcap_session() -> Session:
+    """
+    Get the shared CoinMarketCap HTTP session.
+
+    The session is created once per process and keeps the connection to the API alive between
+    requests, so subsequent price lookups skip the TCP and TLS handshakes.
+
+    Returns:
+    Session: Session with the CoinMarketCap API headers set.
+    """
+    session = Session()
+    session.mount('https://', HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=(502, 503, 504))
+    ))
+    session.headers.update({
+        'Accepts': 'application/json',
+        'X-CMC_PRO_API_KEY': st.secrets['coinmarketcap']['api_key'],
+    })
+    return session
+
 @st.cache_data(ttl=600)
-def get_coinmarketcap_price(symbol: str) -> Union[float, None]:
+def get_coinmarketcap_prices(symbols: Tuple[str, ...]) -> Dict[str, float]:
     """  
-    Get the current price of a cryptocurrency from CoinMarketCap.
+    Get the current prices of several cryptocurrencies from CoinMarketCap in a single request.
+
+    Symbols that CoinMarketCap does not know or has no USD quote for are left out, so one
+    delisted coin does not cost the prices of the others. Errors are raised rather than
+    returned, so a failed request is not cached.
 
     Parameters:
-    - symbol (str): The symbol of the cryptocurrency (e.g., 'BTC').
+    - symbols (Tuple[str, ...]): The symbols of the cryptocurrencies (e.g., ('BTC', 'LINK')).
 
     Returns:
-    float: The current price of the cryptocurrency in USD. Returns None in case of errors.
+    Dict[str, float]: The current prices of the cryptocurrencies in USD by symbol.
 
     Raises:
     - ConnectionError: If there is a problem with the network connection.
     - Timeout: If the request to CoinMarketCap times out.
     - TooManyRedirects: If there are too many redirects in the request.
+    - RetryError: If the request keeps failing with a gateway error after retries.
+    - HTTPError: If CoinMarketCap responds with an error status.
+    - ValueError: If the response is not valid JSON.
     """
     url = 'https://pro-api.coinmarketcap.com/v2/cryptocurrency/quotes/latest'
 
     parameters = {
-        'symbol': symbol,
-        'convert': 'USD'
+        'symbol': ','.join(symbols),
+        'convert': 'USD',
+        'skip_invalid': 'true'
     }
 
-    headers = {
-        'Accepts': 'application/json',
-        'X-CMC_PRO_API_KEY': st.secrets['coinmarketcap']['api_key'],
-    }
+    session = get_coinmarketcap_session()
 
-    session = Session()
-    session.headers.update(headers)
+    response = session.get(url, params=parameters, timeout=5)
+    response.raise_for_status()
+    data = response.json().get('data') or {}
+
+    prices = {}
+    for symbol in symbols:
+        quotes = data.get(symbol) or []
+        price = quotes[0].get('quote', {}).get('USD', {}).get('price') if quotes else None
+        if price is not None:
+            prices[symbol] = price
+
+    return prices
 
+def get_current_prices(symbols: Tuple[str, ...]) -> Dict[str, float]:
+    """
+    Get the current prices of several cryptocurrencies, falling back to no prices on errors.
+
+    Parameters:
+    - symbols (Tuple[str, ...]): The symbols of the cryptocurrencies (e.g., ('BTC', 'LINK')).
+
+    Returns:
+    Dict[str, float]: The current prices of the cryptocurrencies in USD by symbol. Returns an empty dict in case of errors.
+    """
     try:
-        response = session.get(url, params=parameters)
-        data = response.json()
-        return data['data'][symbol][0]['quote']['USD']['price']
-    except (ConnectionError, Timeout, TooManyRedirects) as e:
+        return get_coinmarketcap_prices(symbols)
+    except (ConnectionError, HTTPError, Timeout, TooManyRedirects, RetryError, ValueError):
         st.error(f"Unable to fetch data from CoinMarketCap. Please check your internet connection and try again.")
-        return None
+        return {}
+
+@njit(cache=True)
+def _sharpe_sortino(returns: np.ndarray, risk_free_rate: float, normalization_factor: float) -> Tuple[float, float]:
+    """
+    Calculate Sharpe and Sortino Ratios in a single pass over the returns.
+
+    Mean and standard deviations (ddof=1) are accumulated with Welford's algorithm for all
+    returns and for the negative (downside) returns. NaN values are skipped.
+
+    Parameters:
+    - returns (np.ndarray): Array of returns.
+    - risk_free_rate (float): Annual risk-free rate.
+    - normalization_factor (float): Number of periods over which returns are measured.
+
+    Returns:
+    Tuple[float, float]: Sharpe Ratio and Sortino Ratio. A ratio is 0 when its deviation is not positive.
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    downside_count = 0
+    downside_mean = 0.0
+    downside_m2 = 0.0
+
+    for value in returns:
+        if np.isnan(value):
+            continue
+        count += 1
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+
+        if value < 0:
+            downside_count += 1
+            delta = value - downside_mean
+            downside_mean += delta / downside_count
+            downside_m2 += delta * (value - downside_mean)
+
+    scale = np.sqrt(normalization_factor)
+
+    sharpe_ratio = 0.0
+    if count > 1:
+        std_dev = np.sqrt(m2 / (count - 1))
+        if std_dev > 0:
+            sharpe_ratio = (mean - risk_free_rate) / (std_dev * scale)
+
+    sortino_ratio = 0.0
+    if downside_count > 1:
+        downside_std_dev = np.sqrt(downside_m2 / (downside_count - 1))
+        if downside_std_dev > 0:
+            sortino_ratio = (mean - risk_free_rate) / (downside_std_dev * scale)
+
+    return sharpe_ratio, sortino_ratio
+
+@njit(cache=True)
+def _partition_stats(values: np.ndarray) -> np.ndarray:
+    """
+    Calculate the PROFIT_LOSS_STATS of a partition of yields.
+
+    Parameters:
+    - values (np.ndarray): Yields of the partition.
+
+    Returns:
+    np.ndarray: Statistics in PROFIT_LOSS_STATS order. Undefined statistics of an empty partition are NaN.
+    """
+    stats = np.full(7, np.nan)
+    count = values.shape[0]
+    stats[0] = 0.0
+    stats[2] = count
+    if count == 0:
+        return stats
+
+    mean = 0.0
+    m2 = 0.0
+    total = 0.0
+    minimum = values[0]
+    maximum = values[0]
+    for i in range(count):
+        value = values[i]
+        total += value
+        delta = value - mean
+        mean += delta / (i + 1)
+        m2 += delta * (value - mean)
+        if value < minimum:
+            minimum = value
+        if value > maximum:
+            maximum = value
+
+    stats[0] = total
+    stats[1] = mean
+    if count > 1:
+        stats[3] = np.sqrt(m2 / (count - 1))
+    stats[4] = minimum
+    stats[5] = maximum
+    stats[6] = np.median(values)
+    return stats
+
+@njit(cache=True)
+def _max_drawdown(returns: np.ndarray) -> float:
+    """
+    Calculate the Maximum Drawdown in a single scan over the wealth index.
+
+    NaN returns are skipped, like pandas cumprod and cummax do.
+
+    Parameters:
+    - returns (np.ndarray): Array of returns.
+
+    Returns:
+    float: Maximum Drawdown (NaN when there are no returns other than NaN).
+    """
+    wealth = 1.0
+    peak = -np.inf
+    max_drawdown = np.nan
+    for value in returns:
+        if np.isnan(value):
+            continue
+        wealth *= 1.0 + value
+        if wealth > peak:
+            peak = wealth
+        drawdown = (wealth - peak) / peak
+        if np.isnan(max_drawdown) or drawdown < max_drawdown:
+            max_drawdown = drawdown
+
+    return max_drawdown
+
+@njit(cache=True)
+def _yield_stats(yields: np.ndarray) -> Tuple[np.ndarray, float, int]:
+    """
+    Calculate the yield based metrics of a strategy.
+
+    The scan counts profits (> 0) and losses (< 0) and, along the way, tracks the longest run
+    of consecutive losses. The drawdown comes from _max_drawdown.
+
+    Parameters:
+    - yields (np.ndarray): Array of yields.
+
+    Returns:
+    Tuple[np.ndarray, float, int]:
+        - 2x7 array, the first row holds profit and the second row holds loss PROFIT_LOSS_STATS.
+        - Maximum Drawdown (NaN when there are no yields other than NaN).
+        - Maximum number of consecutive periods in loss.
+    """
+    profit_count = 0
+    loss_count = 0
+    periods_in_loss = 0
+    max_periods_in_loss = 0
+
+    for value in yields:
+        if value > 0:
+            profit_count += 1
+        elif value < 0:
+            loss_count += 1
+
+        if value < 0:
+            periods_in_loss += 1
+            if periods_in_loss > max_periods_in_loss:
+                max_periods_in_loss = periods_in_loss
+        else:
+            periods_in_loss = 0
+
+    profits = np.empty(profit_count)
+    losses = np.empty(loss_count)
+    i = 0
+    j = 0
+    for value in yields:
+        if value > 0:
+            profits[i] = value
+            i += 1
+        elif value < 0:
+            losses[j] = value
+            j += 1
+
+    stats = np.empty((2, 7))
+    stats[0] = _partition_stats(profits)
+    stats[1] = _partition_stats(losses)
+    return stats, _max_drawdown(yields), max_periods_in_loss
 
-@st.cache_data(ttl=3600)
 def calculate_sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.0, normalization_factor: int = 1) -> float:
     """
     Calculate Sharpe Ratio for a given series of returns.
@@ -65,14 +298,10 @@ def calculate_sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.0, norm
     Returns:
     float: Sharpe Ratio. A higher Sharpe Ratio indicates better risk-adjusted performance.
     """
-    if returns.std() > 0:
-        sharpe_ratio = (returns.mean() - risk_free_rate) / (returns.std() * np.sqrt(normalization_factor))
-    else:
-        sharpe_ratio = 0.0
+    sharpe_ratio, _ = _sharpe_sortino(np.asarray(returns, dtype=np.float64), risk_free_rate, normalization_factor)
 
     return sharpe_ratio
 
-@st.cache_data(ttl=3600)
 def calculate_sortino_ratio(returns: pd.Series, risk_free_rate: float = 0.0, normalization_factor: float=1) -> float:
     """
     Calculate Sortino Ratio for a given series of returns.
@@ -89,98 +318,64 @@ def calculate_sortino_ratio(returns: pd.Series, risk_free_rate: float = 0.0, nor
     Returns:
     float: Sortino Ratio. A higher Sortino Ratio indicates better risk-adjusted performance.
     """
-    downside_returns = returns[returns < 0]
-    downside_std_dev = downside_returns.std()
-    
-    if downside_std_dev > 0:
-        sortino_ratio = (returns.mean() - risk_free_rate) / (downside_std_dev * np.sqrt(normalization_factor))
-    else:
-        sortino_ratio = 0
+    _, sortino_ratio = _sharpe_sortino(np.asarray(returns, dtype=np.float64), risk_free_rate, normalization_factor)
     
     return sortino_ratio
 
-@st.cache_data(ttl=3600)
-def calculate_max_drawdown(returns: pd.Series) -> float:
+def calculate_max_drawdown(returns: Union[pd.Series, np.ndarray]) -> float:
     """
     Calculate the Maximum Drawdown, which measures the maximum loss from a peak to a trough.
 
     Parameters:
-    - returns (pd.Series): Series of returns.
+    - returns (Union[pd.Series, np.ndarray]): Series or array of returns.
 
     Returns:
     float: Maximum Drawdown. A measure of the maximum loss from a peak to a trough.
     """
-    wealth_index = (1 + returns).cumprod()
-    previous_peaks = wealth_index.cummax()
-    drawdowns = (wealth_index - previous_peaks) / previous_peaks
-    max_drawdown = drawdowns.min()
+    max_drawdown = _max_drawdown(np.asarray(returns, dtype=np.float64))
 
     return max_drawdown
 
-@st.cache_data(ttl=3600)
-def calculate_duration_of_losses(returns: pd.Series) -> int:
+def calculate_duration_of_losses(returns: Union[pd.Series, np.ndarray]) -> int:
     """
     Calculate the Duration of Losses, which represents the cumulative time the strategy is in a loss.
 
     Parameters:
-    - returns (pd.Series): Series of returns.
+    - returns (Union[pd.Series, np.ndarray]): Series or array of returns.
 
     Returns:
     int: Duration of Losses. Cumulative time the strategy is in a loss.
     """
-    consecutive_losses = (returns < 0).astype(int)
-    periods_in_loss = consecutive_losses.groupby((consecutive_losses != consecutive_losses.shift()).cumsum()).cumsum()
-    max_periods_in_loss = periods_in_loss.max()
+    losses = np.asarray(returns) < 0
+    if not losses.any():
+        return 0
+
+    # boundaries of loss runs: +1 where a run starts, -1 right after it ends
+    boundaries = np.diff(losses.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(boundaries == 1)
+    ends = np.flatnonzero(boundaries == -1)
+    max_periods_in_loss = int((ends - starts).max())
 
     return max_periods_in_loss
 
 @st.cache_data(ttl=600)
-def calculate_strategy_stats(strategy_data: pd.DataFrame) -> pd.Series:
+def _calculate_strategy_stats(portfolio: np.ndarray, yields: np.ndarray) -> pd.Series:
     """
-    Calculate various performance metrics for a given trading strategy based on historical data.
+    Calculate the performance metrics of calculate_strategy_stats from the columns that drive them.
 
     Parameters:
-    - strategy_data (pd.DataFrame): DataFrame containing historical data for the trading strategy.
-        It should include the following columns:
-            - 'Coin' (str): Tickers of coins (uppercase), for example, 'BTC'.
-            - 'Purchase price' (float): Price of coin (Coin).
-            - 'Portfolio' (float): Portfolio value at a given date.
-            - 'Quantity' (float): Amount of purchased coins (Coin).
-            - 'Profit / Loss %' (float): Profitability as Month-over-Month return for each period.
+    - portfolio (np.ndarray): Portfolio values for each period.
+    - yields (np.ndarray): Profit / Loss % for each period.
 
     Returns:
-    StrategyKeyMetrics: A NamedTuple containing calculated performance metrics for the trading strategy.
-
-    Metrics:
-    - Life Period: Number of periods (rows) in the strategy data.
-    - Profit Count: Number of profitable trades.
-    - Loss Count: Number of losing trades.
-    - MoM (Month-over-Month): Percentage change in the latest coin price compared to the purchase price.
-    - ROI (Return on Investment): Percentage return on investment from the start to the latest period.
-    - Monthly Return with Compound Interest: Compound monthly return of the strategy.
-    - Mean Profit: Average profit percentage per trade.
-    - Mean Loss: Average loss percentage per trade.
-    - Median Profit: Median profit percentage per trade.
-    - Median Loss: Median loss percentage per trade.
-    - Std Profit: Standard deviation of profit percentages.
-    - Std Loss: Standard deviation of loss percentages.
-    - Maximum Profit: Maximum profit percentage in a single trade.
-    - Maximum Loss: Maximum loss percentage in a single trade.
-    - Minimum Profit: Minimum profit percentage in a single trade.
-    - Minimum Loss: Minimum loss percentage in a single trade.
-    - Sharpe Ratio: Risk-adjusted return metric.
-    - Sortino Ratio: Risk-adjusted return metric focusing on downside volatility.
-    - Max Drawdown: Maximum loss from a peak to a trough.
-    - Max Periods in Loss: Cumulative time the strategy is in a loss.
-
-    Note:
-    - The function uses additional functions like calculate_sharpe_ratio, calculate_sortino_ratio,
-      calculate_max_drawdown, and calculate_duration_of_losses for specific metric calculations.
+    pd.Series: Performance metrics of the strategy.
     """
+    life_period = yields.shape[0]
+
     # Get start and current portfolio balances
-    start_portfolio_balance = strategy_data['Portfolio'].iloc[0]
-    current_portfolio_balance = strategy_data['Portfolio'].iloc[-1]
-    months_count = strategy_data.shape[0] - 1
+    start_portfolio_balance = portfolio[0]
+    current_portfolio_balance = portfolio[-1]
+    months_count = life_period - 1
 
     # Calculate ROI, and Monthly return with compound interest
     roi = (current_portfolio_balance - start_portfolio_balance) / start_portfolio_balance
@@ -189,46 +384,29 @@ def calculate_strategy_stats(strategy_data: pd.DataFrame) -> pd.Series:
         return_with_compound_interest = (current_portfolio_balance / start_portfolio_balance) ** (1/months_count) - 1
     except ZeroDivisionError:
         return_with_compound_interest = 0
-        
-    # get all yields of the strategy
-    yields = strategy_data['Profit / Loss %'].copy()
-
-    # calculate basic metrics
-    profit_metrics = yields[yields > 0].agg({
-        'Total': 'sum',
-        'Mean': 'mean',
-        'Count': 'count',
-        'Standard Deviation': 'std',
-        'Minimum': 'min',
-        'Maximum': 'max',
-        'Median': 'median'
-    })
 
-    loss_metrics = yields[yields < 0].agg({
-        'Total': 'sum',
-        'Mean': 'mean',
-        'Count': 'count',
-        'Standard Deviation': 'std',
-        'Minimum': 'min',
-        'Maximum': 'max',
-        'Median': 'median'
-    })
+    # calculate basic metrics, Max Drawdown, and Duration of Losses in one scan
+    profit_loss_stats, max_drawdown, duration_of_losses = _yield_stats(yields)
+    profit_metrics = pd.Series(profit_loss_stats[0], index=PROFIT_LOSS_STATS)
+    loss_metrics = pd.Series(profit_loss_stats[1], index=PROFIT_LOSS_STATS)
+
+    # Calculate Sharpe Ratio and Sortino Ratio
+    valid_count = np.count_nonzero(~np.isnan(yields))
+    sharpe_ratio, sortino_ratio = _sharpe_sortino(yields, 0.0, valid_count)
 
-    # Calculate Sharpe Ratio, Sortino Ratio, Max Drawdown, and Duration of Losses
-    sharpe_ratio = calculate_sharpe_ratio(yields, normalization_factor=yields.count())
-    sortino_ratio = calculate_sortino_ratio(yields, normalization_factor=yields.count())
-    max_drawdown = calculate_max_drawdown(yields)
-    duration_of_losses = calculate_duration_of_losses(yields)
+    # mean and std are undefined below 1 and 2 valid yields, return NaN like pandas does
+    average_return = np.nanmean(yields) if valid_count > 0 else np.nan
+    volatility = np.nanstd(yields, ddof=1) if valid_count > 1 else np.nan
 
     metrics = {
-        'life_period': strategy_data.shape[0],
-        'profit_count': profit_metrics['Count'],
-        'loss_count': loss_metrics['Count'],
-        'month_over_month': strategy_data['Profit / Loss %'].iloc[-1],
+        'life_period': life_period,
+        'profit_count': int(profit_metrics['Count']),
+        'loss_count': int(loss_metrics['Count']),
+        'month_over_month': yields[-1],
         'return_on_investment': roi,
         'monthly_return_with_compound_interest': return_with_compound_interest,
-        'average_return': strategy_data['Profit / Loss %'].mean(),
-        'volatility': strategy_data['Profit / Loss %'].std(),
+        'average_return': average_return,
+        'volatility': volatility,
         'mean_profit': profit_metrics['Mean'],
         'mean_loss': loss_metrics['Mean'],
         'median_profit': profit_metrics['Median'],
@@ -249,13 +427,64 @@ def calculate_strategy_stats(strategy_data: pd.DataFrame) -> pd.Series:
 
     return metrics_series
 
+def calculate_strategy_stats(strategy_data: pd.DataFrame) -> pd.Series:
+    """
+    Calculate various performance metrics for a given trading strategy based on historical data.
+
+    Parameters:
+    - strategy_data (pd.DataFrame): DataFrame containing historical data for the trading strategy.
+        It should include the following columns:
+            - 'Coin' (str): Tickers of coins (uppercase), for example, 'BTC'.
+            - 'Purchase price' (float): Price of coin (Coin).
+            - 'Portfolio' (float): Portfolio value at a given date.
+            - 'Quantity' (float): Amount of purchased coins (Coin).
+            - 'Profit / Loss %' (float): Profitability as Month-over-Month return for each period.
+
+    Returns:
+    StrategyKeyMetrics: A NamedTuple containing calculated performance metrics for the trading strategy.
+
+    Metrics:
+    - Life Period: Number of periods (rows) in the strategy data.
+    - Profit Count: Number of profitable trades.
+    - Loss Count: Number of losing trades.
+    - MoM (Month-over-Month): Percentage change in the latest coin price compared to the purchase price.
+    - ROI (Return on Investment): Percentage return on investment from the start to the latest period.
+    - Monthly Return with Compound Interest: Compound monthly return of the strategy.
+    - Mean Profit: Average profit percentage per trade.
+    - Mean Loss: Average loss percentage per trade.
+    - Median Profit: Median profit percentage per trade.
+    - Median Loss: Median loss percentage per trade.
+    - Std Profit: Standard deviation of profit percentages.
+    - Std Loss: Standard deviation of loss percentages.
+    - Maximum Profit: Maximum profit percentage in a single trade.
+    - Maximum Loss: Maximum loss percentage in a single trade.
+    - Minimum Profit: Minimum profit percentage in a single trade.
+    - Minimum Loss: Minimum loss percentage in a single trade.
+    - Sharpe Ratio: Risk-adjusted return metric.
+    - Sortino Ratio: Risk-adjusted return metric focusing on downside volatility.
+    - Max Drawdown: Maximum loss from a peak to a trough.
+    - Max Periods in Loss: Cumulative time the strategy is in a loss.
+
+    Note:
+    - The yield based metrics are computed by the compiled kernels _yield_stats and _sharpe_sortino,
+      which match calculate_max_drawdown, calculate_duration_of_losses, calculate_sharpe_ratio,
+      and calculate_sortino_ratio.
+    """
+    # Only the portfolio and yields drive the metrics, so the cache is keyed on these two arrays
+    # rather than on the whole DataFrame
+    return _calculate_strategy_stats(
+        strategy_data['Portfolio'].to_numpy(dtype=np.float64),
+        strategy_data['Profit / Loss %'].to_numpy(dtype=np.float64)
+    )
+
 @st.cache_data(ttl=600)
-def update_portfolio_current_balance(strategy_data: pd.DataFrame) -> pd.DataFrame:
+def update_portfolio_current_balance(strategy_data: pd.DataFrame, current_prices: Dict[str, float]) -> pd.DataFrame:
     """
     Update the current balance of the portfolio based on the latest market data.
 
     Parameters:
     - strategy_data (pd.DataFrame): DataFrame containing portfolio data.
+    - current_prices (Dict[str, float]): Current coin prices in USD by symbol.
 
     Returns:
     pd.DataFrame: Updated DataFrame with the current balance information.
@@ -271,15 +500,20 @@ def update_portfolio_current_balance(strategy_data: pd.DataFrame) -> pd.DataFram
 
         latest_coin = strategy_data['Coin'].iloc[-1]
 
-        current_price = get_coinmarketcap_price(f'{latest_coin}')
+        current_price = current_prices.get(f'{latest_coin}')
+        if current_price is None:
+            st.warning(f"No current price for {latest_coin}. Unable to update portfolio balance.")
+            return strategy_data
+
         purchase_price = strategy_data['Purchase price'].iloc[-1]
 
         current_rate_of_return = (current_price - purchase_price) / purchase_price
         current_portfolio_balance = strategy_data['Quantity'].iloc[-1] * current_price
 
-        strategy_data.loc[strategy_data.index[-1], 'Sell price'] = current_price
-        strategy_data.loc[strategy_data.index[-1], 'Profit / Loss %'] = current_rate_of_return
-        strategy_data.loc[strategy_data.index[-1], 'Portfolio'] = current_portfolio_balance
+        last_row = strategy_data.index[-1]
+        strategy_data.at[last_row, 'Sell price'] = current_price
+        strategy_data.at[last_row, 'Profit / Loss %'] = current_rate_of_return
+        strategy_data.at[last_row, 'Portfolio'] = current_portfolio_balance
 
         return strategy_data
     
@@ -287,7 +521,6 @@ def update_portfolio_current_balance(strategy_data: pd.DataFrame) -> pd.DataFram
         st.warning(f'Error updating current balance for {latest_coin}: {e}')
         return strategy_data
 
-@st.cache_data(ttl=600)
 def calculate_compound_interest_dynamics(portfolio_balance: pd.Series, dates: pd.Series) -> pd.Series:
     """
     Calculate the compound interest dynamics based on the portfolio balance over time.
@@ -299,14 +532,15 @@ def calculate_compound_interest_dynamics(portfolio_balance: pd.Series, dates: pd
     Returns:
     pd.Series: Compound interest dynamics.
     """
-    start_portfolio_balance = portfolio_balance.iloc[0]
-    compound_interests = pd.Series(index=dates, dtype=float)
-    
-    for month, current_balance in zip(itertools.count(), portfolio_balance):
-        try:
-            compound_interests[dates[month]] = (current_balance / start_portfolio_balance) ** (1 / month) - 1
-        except ZeroDivisionError:
-            compound_interests[dates[month]] = 0
+    balance = portfolio_balance.to_numpy(dtype=np.float64)
+    months = np.arange(balance.shape[0], dtype=np.float64)
+
+    # the first month has no compounding period, so its rate is 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = np.power(balance / balance[0], 1.0 / np.where(months > 0, months, 1.0)) - 1.0
+    rates[0] = 0.0
+
+    compound_interests = pd.Series(rates, index=pd.Index(dates))
 
     return compound_interests
 
@@ -345,7 +579,6 @@ def show_main_key_stats(key_stats: pd.Series) -> None:
                       f"{round(key_stats['mean_loss']*100, 2)}%",
                       help='The Average Value of the Loss')
 
-@st.cache_data(ttl=600)
 def calculate_strategy_share(yields: pd.Series) -> pd.DataFrame:
     """
     Calculate the share of profit, loss, and hodl categories in a trading strategy based on yields.
@@ -366,10 +599,9 @@ def calculate_strategy_share(yields: pd.Series) -> pd.DataFrame:
     HODL    0.2
     ```
     """
-    return (yields.apply(lambda x: 'profit' if x > 0 else 'loss' if x < 0 else 'hodl')
-                                      .value_counts(normalize=True)
-                                      .rename(index={'profit': 'PROFIT', 'loss': 'LOSS', 'hodl': 'HODL'})
-                                      .to_frame())
+    values = yields.to_numpy()
+    categories = np.select([values > 0, values < 0], ['PROFIT', 'LOSS'], default='HODL')
+    return pd.Series(categories).value_counts(normalize=True).to_frame('Share')
 
 @st.cache_data(ttl=600)
 def describe_profit_loss(data: pd.DataFrame, exclude_outliers: bool=False) -> pd.DataFrame:
@@ -386,12 +618,14 @@ def describe_profit_loss(data: pd.DataFrame, exclude_outliers: bool=False) -> pd
     if exclude_outliers:
         data = data[data['Profit / Loss %'].between(-5, 5)]
 
-    data = data[data['Profit / Loss %'] != 0]
-    result = data.groupby(data['Profit / Loss %'] > 0)['Profit / Loss %']\
-        .apply(lambda x: x.abs().describe())\
-        .unstack()\
-        .rename(index={True: 'Profit', False: 'Loss'})
-    result.index.name = None
+    profit_loss = data.loc[data['Profit / Loss %'] != 0, 'Profit / Loss %']
+    absolute_profit_loss = profit_loss.abs()
+    is_profit = profit_loss > 0
+
+    result = pd.DataFrame({
+        'Loss': absolute_profit_loss[~is_profit].describe(),
+        'Profit': absolute_profit_loss[is_profit].describe()
+    }).T
     return result
 
 def exclude_outliers(strategy_data: pd.DataFrame) -> pd.DataFrame:
@@ -410,19 +644,40 @@ def exclude_outliers(strategy_data: pd.DataFrame) -> pd.DataFrame:
     filtered_data = strategy_data[strategy_data['Profit / Loss %'].between(-5, 5)].reset_index()
     return filtered_data
 
-def update_and_exclude_outliers(strategy_data: pd.DataFrame) -> pd.DataFrame:
+def update_and_exclude_outliers(strategy_data: pd.DataFrame, current_prices: Dict[str, float]) -> pd.DataFrame:
     """
     Update current balance the given strategy and exclude outliers if chosen.
 
     Parameters:
     - strategy_data (pd.DataFrame): DataFrame containing the strategy data.
+    - current_prices (Dict[str, float]): Current coin prices in USD by symbol.
 
     Returns:
     pd.DataFrame: Updated DataFrames for the strategy.
     """
-    updated_data = update_portfolio_current_balance(strategy_data)
+    updated_data = update_portfolio_current_balance(strategy_data, current_prices)
     return updated_data
 
+def downsample_for_chart(data: Union[pd.DataFrame, pd.Series], max_points: int = CHART_MAX_POINTS) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Keep every n-th row so that at most max_points rows are sent to a chart.
+
+    The last row is always kept so the chart ends at the current balance.
+
+    Parameters:
+    - data (Union[pd.DataFrame, pd.Series]): Data to be plotted.
+    - max_points (int): Maximum number of rows to keep.
+
+    Returns:
+    Union[pd.DataFrame, pd.Series]: Downsampled data.
+    """
+    if len(data) <= max_points:
+        return data
+
+    step = -(-len(data) // max_points)
+    positions = np.arange(len(data) - 1, -1, -step)[::-1]
+    return data.iloc[positions]
+
 def display_main_key_metrics(momentum_stats: pd.Series, hodl_btc_stats: pd.Series) -> None:
     """
     Display main key metrics for trading strategies.
@@ -451,7 +706,7 @@ def display_strategy_comparison_chart(momentum_data: pd.DataFrame) -> None:
     None
     """
     st.subheader('*Momentum Strategy vs HODL BTC*')
-    st.line_chart(data=momentum_data, x='Purchase date', y=['Portfolio', 'Hodl BTC'])
+    st.line_chart(data=downcast_floats(downsample_for_chart(momentum_data[['Purchase date', 'Portfolio', 'Hodl BTC']])), x='Purchase date', y=['Portfolio', 'Hodl BTC'])
 
 def display_return_with_compound_interest(momentum_data: pd.DataFrame) -> None:
     """
@@ -474,7 +729,7 @@ def display_return_with_compound_interest(momentum_data: pd.DataFrame) -> None:
             st.metric("Mean CI", f'{round(compound_interests.mean()*100, 2)}%')
         with col3:
             st.metric("CI StDev", f'{round(compound_interests.std()*100, 2)}%')
-        st.bar_chart(compound_interests)
+        st.bar_chart(downsample_for_chart(compound_interests).astype(np.float32))
 
 def display_raw_data(momentum_data: pd.DataFrame) -> None:
     """
@@ -488,7 +743,15 @@ def display_raw_data(momentum_data: pd.DataFrame) -> None:
     """
     st.subheader('*Raw Data*')
     with st.expander('See Strategy Raw Data'):
-        st.dataframe(momentum_data, use_container_width=True)
+        # send one page of rows to the browser instead of the whole history,
+        # pages count back from the most recent rows
+        pages_count = max(1, -(-len(momentum_data) // RAW_DATA_PAGE_SIZE))
+        page = 1
+        if pages_count > 1:
+            page = st.number_input('Page (1 is the most recent)', min_value=1, max_value=pages_count, value=1, step=1, key='raw_data_page')
+        end = len(momentum_data) - (page - 1) * RAW_DATA_PAGE_SIZE
+        start = max(0, end - RAW_DATA_PAGE_SIZE)
+        st.dataframe(downcast_floats(momentum_data.iloc[start:end]), use_container_width=True)
 
 @st.cache_data(ttl=600)
 def retrive_data_from_gsheet(gsheet_connection: str, sheet: str) -> pd.DataFrame:
@@ -504,6 +767,37 @@ def retrive_data_from_gsheet(gsheet_connection: str, sheet: str) -> pd.DataFrame
     if validate_data(df):
         return df
 
+def retrive_strategies_data(gsheet_connection: str, sheets: Tuple[str, ...]) -> Tuple[pd.DataFrame, ...]:
+    """
+    Retrieve several strategy sheets, downloading them concurrently.
+
+    Only the network bound raw downloads run in worker threads and they don't render any elements.
+    The downloads fill the connection's query cache, then each sheet is processed and its download
+    status rendered on the script thread by retrive_data_from_gsheet.
+
+    Parameters:
+    - gsheet_connection (str): Google Sheets connection string.
+    - sheets (Tuple[str, ...]): Names of the sheets.
+
+    Returns:
+    Tuple[pd.DataFrame, ...]: Strategy data in the order of the sheets.
+    """
+    spreadsheet = MomentumSheetsConnector(gsheet_connection)
+    script_run_ctx = get_script_run_ctx()
+
+    def download_sheet(sheet: str) -> None:
+        add_script_run_ctx(ctx=script_run_ctx)
+        try:
+            spreadsheet.download_sheet(sheet)
+        except Exception:
+            # the error is reported when the sheet is retrieved on the script thread
+            pass
+
+    with ThreadPoolExecutor(max_workers=len(sheets)) as executor:
+        list(executor.map(download_sheet, sheets))
+
+    return tuple(retrive_data_from_gsheet(gsheet_connection, sheet) for sheet in sheets)
+
 @st.cache_data(ttl=600)
 def validate_data(df: pd.DataFrame) -> bool:
     """
@@ -560,8 +854,9 @@ def display_date_range_slider(data: pd.DataFrame, date_column: str) -> None:
     display_date_range_slider(momentum_data, 'Purchase date')
     ```
     """
-    min_date = min(data[date_column].dt.year)
-    max_date = max(data[date_column].dt.year)
+    years = data[date_column].dt.year.to_numpy()
+    min_date = int(years.min())
+    max_date = int(years.max())
 
     st.slider('Choose date range to display', 
               min_value=min_date, 
@@ -588,7 +883,9 @@ def update_dataframe_by_date_range(data: pd.DataFrame, date_column: str, slider_
     updated_momentum_data = update_dataframe_by_date_range(momentum_data, 'Purchase date', st.session_state.date_range_slider)
     ```
     """
-    updated_data = data[data[date_column].dt.year.between(slider_value[0], slider_value[1])].reset_index(drop=True)
+    years = data[date_column].dt.year.to_numpy()
+    mask = (years >= slider_value[0]) & (years <= slider_value[1])
+    updated_data = data[mask].reset_index(drop=True)
     return updated_data    
 
 def show_main_tab() -> None:
@@ -603,21 +900,24 @@ def show_main_tab() -> None:
     None
     """
     # load strategies data from google sheet
-    momentum_data = retrive_data_from_gsheet('gsheets', 'streamlit')
-    hodl_btc_data = retrive_data_from_gsheet('gsheets', 'hodl_btc')
+    momentum_data, hodl_btc_data = retrive_strategies_data('gsheets', ('streamlit', 'hodl_btc'))
     
     st.subheader(f"Current Momentum Strategy Coin: {momentum_data['Coin'].iloc[-1]}")
     # display slider to choose analytical period
     display_date_range_slider(momentum_data, "Purchase date")
 
     # exclude outliers for both strategies if choosen
-    if st.toggle('Exclude outliers', help='Whether to exclude outliers beyond the range [-500%, 500%]'):
+    if st.toggle('Exclude outliers', help='Whether to exclude outliers beyond the range [-500%, 500%]', key='exclude_outliers'):
         momentum_data = exclude_outliers(momentum_data)
         hodl_btc_data = exclude_outliers(hodl_btc_data)
 
+    # Fetch current prices of both strategies' coins in a single request
+    latest_coins = tuple(sorted({momentum_data['Coin'].iloc[-1], hodl_btc_data['Coin'].iloc[-1]}))
+    current_prices = get_current_prices(latest_coins)
+
     # Update current balance for both strategies
-    momentum_data = update_and_exclude_outliers(momentum_data)
-    hodl_btc_data = update_and_exclude_outliers(hodl_btc_data)
+    momentum_data = update_and_exclude_outliers(momentum_data, current_prices)
+    hodl_btc_data = update_and_exclude_outliers(hodl_btc_data, current_prices)
 
     # Update dataframe by slider date range
     momentum_data = update_dataframe_by_date_range(momentum_data, 'Purchase date', st.session_state.date_range_slider)
@@ -1,42 +1,85 @@
 import streamlit as st
 import pandas as pd
-from .gsheets.sheets_connector import CoinApiSheetsConnector
+from .tab_corr import retrieve_coin_api_data
 from prophet import Prophet
 from prophet.plot import plot_plotly, plot_components_plotly
 
 
+# memory budget for fitted models: each one keeps its training history and fitted
+# parameters in the process, and the training data changes with every refresh of the
+# coin data cache. With more coins than this, switching between them refits evicted models
+PROPHET_MAX_CACHED_MODELS = 10
+
+PROPHET_TAB_WIDGET_KEYS = ('coin_to_predict',)
+
+
 @st.cache_data(ttl=600)
 def convert_df(df: pd.DataFrame):
     return df.to_csv().encode('utf-8')
 
-st.cache_data(ttl=600)
+@st.cache_resource(ttl=3600, max_entries=PROPHET_MAX_CACHED_MODELS)
+def fit_prophet_model(train_df: pd.DataFrame) -> Prophet:
+    """
+    Fit a Prophet model once per training data and share it across reruns.
+
+    Parameters:
+    - train_df (pd.DataFrame): Training data with 'ds' and 'y' columns.
+
+    Returns:
+    Prophet: Fitted Prophet model.
+    """
+    model = Prophet()
+    model.fit(train_df)
+    return model
+
+@st.cache_data(ttl=3600, max_entries=PROPHET_MAX_CACHED_MODELS)
+def predict_prophet_forecast(train_df: pd.DataFrame, periods: int = 20) -> pd.DataFrame:
+    """
+    Predict future prices with the Prophet model fitted on the training data.
+
+    Parameters:
+    - train_df (pd.DataFrame): Training data with 'ds' and 'y' columns.
+    - periods (int): Number of hours to predict.
+
+    Returns:
+    pd.DataFrame: Prophet forecast.
+    """
+    model = fit_prophet_model(train_df)
+    future = model.make_future_dataframe(periods=periods, freq='H')
+    return model.predict(future)
+
+def prepare_training_data(df: pd.DataFrame, coin: str) -> pd.DataFrame:
+    """
+    Prepare Prophet training data for a coin from the coin API data.
+
+    The target is the coin price 12 hours ahead of each timestamp.
+
+    Parameters:
+    - df (pd.DataFrame): Coin API data with a 'datetime' column.
+    - coin (str): Coin to predict.
+
+    Returns:
+    pd.DataFrame: Training data with 'ds' and 'y' columns.
+    """
+    train_df = df[["datetime", coin]].rename(columns={'datetime': 'ds'})
+    train_df["ds"] = train_df["ds"].dt.tz_convert(None)
+    train_df["y"] = train_df[coin].shift(-12)
+    return train_df.dropna()
+
 def show_prophet_tab():
     # get raw data
-    spreadsheet = CoinApiSheetsConnector("coinapigsheets")
-    df = spreadsheet.get_data_from_sheet("raw_data")
+    df = retrieve_coin_api_data("coinapigsheets", "raw_data")
 
     st.selectbox("Select Coin to Predict Price:", df.columns[1:], index=0, key="coin_to_predict")
 
     # select data
     coin_to_predict = st.session_state.coin_to_predict
-    print(coin_to_predict)
-    btc_df = df[["datetime", coin_to_predict]].copy()
-    
-    # modify df
-    btc_df.rename(columns={'datetime': 'ds'}, inplace=True)
-    btc_df["ds"] = btc_df["ds"].dt.tz_convert(None)
-    btc_df["y"] = btc_df[coin_to_predict].shift(-12)
-    btc_df.dropna(inplace=True)
-
-    # instantiating a new Prophet object
-    m = Prophet()
-    m.fit(btc_df)
-
-    # make future df
-    future = m.make_future_dataframe(periods=20, freq='H')
-
-    # predict future prices
-    forecast = m.predict(future)
+    btc_df = prepare_training_data(df, coin_to_predict)
+
+    # get the fitted Prophet model and predict future prices
+    with st.spinner(f"Fitting {coin_to_predict} forecast..."):
+        m = fit_prophet_model(btc_df)
+        forecast = predict_prophet_forecast(btc_df)
 
     st.subheader(f"*Forecast {coin_to_predict} Data*")
 
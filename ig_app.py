@@ -1,25 +1,45 @@
 import streamlit as st
-from components.tab_main import show_main_tab
+from components.tab_main import show_main_tab, MAIN_TAB_WIDGET_KEYS
 from components.about import about_text
-from components.tab_corr import show_corr_data
-from components.tab_prophet import show_prophet_tab
+from components.tab_corr import show_corr_data, CORR_TAB_WIDGET_KEYS
+from components.tab_prophet import show_prophet_tab, PROPHET_TAB_WIDGET_KEYS
 
 
+MENU_ITEMS = {
+    'Get Help': 'https://www.somelink.com/help',
+    'Report a bug': "https://www.somelink.com/bug",
+    'About': about_text
+}
+
+TABS = {
+    'main': show_main_tab,
+    'corr': show_corr_data,
+    'prophet': show_prophet_tab,
+}
+
+TAB_WIDGET_KEYS = {
+    'main': MAIN_TAB_WIDGET_KEYS,
+    'corr': CORR_TAB_WIDGET_KEYS,
+    'prophet': PROPHET_TAB_WIDGET_KEYS,
+}
+
 st.set_page_config(
     page_title='IG Statistics Dashboard', 
     layout="wide",
-    menu_items={
-        'Get Help': 'https://www.somelink.com/help',
-        'Report a bug': "https://www.somelink.com/bug",
-        'About': about_text
-    }
+    menu_items=MENU_ITEMS
 )
 
 st.header("IG Strategies Analytics")    
-main_tab, corr_tab, prophet = st.tabs(['main', 'corr', 'prophet'])
-with main_tab:
-    show_main_tab()
-with corr_tab:
-    show_corr_data()
-with prophet:
-    show_prophet_tab()
+# st.tabs runs every tab body on each rerun, so render only the selected one
+selected_tab = st.radio('Tab', list(TABS), horizontal=True, label_visibility='collapsed', key='selected_tab')
+
+# Streamlit drops the state of widgets that are not rendered, so keep the selections
+# of the hidden tabs as regular session state until their widgets are shown again
+for tab, widget_keys in TAB_WIDGET_KEYS.items():
+    if tab == selected_tab:
+        continue
+    for key in widget_keys:
+        if key in st.session_state:
+            st.session_state[key] = st.session_state[key]
+
+TABS[selected_tab]()
@@ -0,0 +1,177 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from requests.exceptions import ConnectionError
+
+from components import tab_main
+from components.tab_main import (
+    PROFIT_LOSS_STATS,
+    _partition_stats,
+    _sharpe_sortino,
+    _yield_stats,
+    calculate_duration_of_losses,
+    calculate_max_drawdown,
+    calculate_sharpe_ratio,
+    calculate_sortino_ratio,
+    calculate_strategy_stats,
+    get_coinmarketcap_prices,
+    get_current_prices,
+)
+
+
+AGGREGATIONS = {
+    'Total': 'sum',
+    'Mean': 'mean',
+    'Count': 'count',
+    'Standard Deviation': 'std',
+    'Minimum': 'min',
+    'Maximum': 'max',
+    'Median': 'median'
+}
+
+YIELDS = {
+    'empty': [],
+    'single loss': [-0.1],
+    'all nan': [np.nan, np.nan, np.nan],
+    'nan in the middle': [0.1, -0.2, np.nan, 0.05, -0.3, -0.1],
+    'hodl': [0.0, 0.0, 0.0],
+    'mixed': [0.12, -0.05, -0.08, 0.0, 0.3, -0.4, -0.01, 0.07, 0.02, -0.15],
+}
+
+
+def baseline_sharpe_ratio(returns: pd.Series, normalization_factor: int) -> float:
+    if returns.std() > 0:
+        return (returns.mean() - 0.0) / (returns.std() * np.sqrt(normalization_factor))
+    return 0.0
+
+
+def baseline_sortino_ratio(returns: pd.Series, normalization_factor: int) -> float:
+    downside_std_dev = returns[returns < 0].std()
+    if downside_std_dev > 0:
+        return (returns.mean() - 0.0) / (downside_std_dev * np.sqrt(normalization_factor))
+    return 0.0
+
+
+def baseline_max_drawdown(returns: pd.Series) -> float:
+    wealth_index = (1 + returns).cumprod()
+    previous_peaks = wealth_index.cummax()
+    drawdowns = (wealth_index - previous_peaks) / previous_peaks
+    return drawdowns.min()
+
+
+def baseline_duration_of_losses(returns: pd.Series) -> float:
+    consecutive_losses = (returns < 0).astype(int)
+    periods_in_loss = consecutive_losses.groupby((consecutive_losses != consecutive_losses.shift()).cumsum()).cumsum()
+    return periods_in_loss.max()
+
+
+@pytest.fixture(params=YIELDS.values(), ids=YIELDS.keys())
+def yields(request) -> pd.Series:
+    return pd.Series(request.param, dtype=np.float64)
+
+
+def test_partition_stats_match_pandas_agg(yields):
+    stats, _, _ = _yield_stats(yields.to_numpy())
+
+    for row, partition in enumerate([yields[yields > 0], yields[yields < 0]]):
+        expected = partition.agg(AGGREGATIONS)[list(PROFIT_LOSS_STATS)].to_numpy(dtype=np.float64)
+        np.testing.assert_allclose(stats[row], expected, equal_nan=True)
+        np.testing.assert_allclose(_partition_stats(partition.to_numpy()), expected, equal_nan=True)
+
+
+def test_max_drawdown_matches_pandas(yields):
+    expected = baseline_max_drawdown(yields)
+    _, max_drawdown, _ = _yield_stats(yields.to_numpy())
+
+    np.testing.assert_allclose(max_drawdown, expected, equal_nan=True)
+    np.testing.assert_allclose(calculate_max_drawdown(yields), expected, equal_nan=True)
+
+
+def test_duration_of_losses_matches_pandas(yields):
+    # pandas returns NaN for the max of an empty series, the metric is a count of periods
+    expected = 0 if yields.empty else baseline_duration_of_losses(yields)
+    _, _, max_periods_in_loss = _yield_stats(yields.to_numpy())
+
+    assert max_periods_in_loss == expected
+    assert calculate_duration_of_losses(yields) == expected
+
+
+def test_sharpe_sortino_match_pandas(yields):
+    normalization_factor = yields.count()
+    expected_sharpe = baseline_sharpe_ratio(yields, normalization_factor)
+    expected_sortino = baseline_sortino_ratio(yields, normalization_factor)
+
+    sharpe_ratio, sortino_ratio = _sharpe_sortino(yields.to_numpy(), 0.0, normalization_factor)
+
+    np.testing.assert_allclose(sharpe_ratio, expected_sharpe)
+    np.testing.assert_allclose(sortino_ratio, expected_sortino)
+    np.testing.assert_allclose(calculate_sharpe_ratio(yields, normalization_factor=normalization_factor), expected_sharpe)
+    np.testing.assert_allclose(calculate_sortino_ratio(yields, normalization_factor=normalization_factor), expected_sortino)
+
+
+@pytest.mark.parametrize('strategy_yields', [[0.05], [np.nan, 0.05]], ids=['single yield', 'single valid yield'])
+def test_strategy_stats_of_single_yield_match_pandas_without_warnings(strategy_yields):
+    strategy_data = pd.DataFrame({
+        'Portfolio': np.linspace(100.0, 105.0, len(strategy_yields)),
+        'Profit / Loss %': strategy_yields,
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        stats = calculate_strategy_stats(strategy_data)
+
+    np.testing.assert_allclose(stats['average_return'], strategy_data['Profit / Loss %'].mean())
+    assert np.isnan(stats['volatility']) and np.isnan(strategy_data['Profit / Loss %'].std())
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    def get(self, url, params=None, timeout=None):
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def quote(price):
+    return [{'quote': {'USD': {'price': price}}}]
+
+
+@pytest.fixture
+def coinmarketcap(monkeypatch):
+    get_coinmarketcap_prices.clear()
+
+    def use_session(session):
+        monkeypatch.setattr(tab_main, 'get_coinmarketcap_session', lambda: session)
+
+    yield use_session
+    get_coinmarketcap_prices.clear()
+
+
+def test_coinmarketcap_prices_skip_unknown_symbols(coinmarketcap):
+    coinmarketcap(FakeSession(FakeResponse({'data': {'BTC': quote(42000.0), 'LINK': []}})))
+
+    assert get_current_prices(('BTC', 'DELISTED', 'LINK')) == {'BTC': 42000.0}
+
+
+def test_coinmarketcap_request_errors_are_not_cached(coinmarketcap):
+    coinmarketcap(FakeSession(ConnectionError(), FakeResponse({'data': {'BTC': quote(42000.0)}})))
+
+    assert get_current_prices(('BTC',)) == {}
+    assert get_current_prices(('BTC',)) == {'BTC': 42000.0}
@@ -0,0 +1,29 @@
+import ast
+import re
+from pathlib import Path
+
+import pytest
+
+
+COMPONENTS_DIR = Path(__file__).resolve().parent.parent / 'components'
+
+TAB_MODULES = {
+    'tab_main.py': 'MAIN_TAB_WIDGET_KEYS',
+    'tab_corr.py': 'CORR_TAB_WIDGET_KEYS',
+    'tab_prophet.py': 'PROPHET_TAB_WIDGET_KEYS',
+}
+
+
+def read_constant(tree: ast.Module, name: str) -> tuple:
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == name for target in node.targets):
+            return ast.literal_eval(node.value)
+    raise AssertionError(f'{name} is not defined')
+
+
+@pytest.mark.parametrize('module, constant', TAB_MODULES.items())
+def test_tab_widget_keys_cover_all_widgets(module, constant):
+    source = (COMPONENTS_DIR / module).read_text()
+    widget_keys = set(re.findall(r"""key=['"]([^'"]+)['"]""", source))
+
+    assert set(read_constant(ast.parse(source), constant)) == widget_keys